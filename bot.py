@@ -1,13 +1,20 @@
 import json
 import os
 import discord
+from discord import app_commands
 import asyncio
 import random
 import re
+import signal
 import time
 from openai import OpenAI
 from dotenv import load_dotenv
 import sqlite3
+import content
+import library
+import simulator
+
+STARTUP_TIME = time.perf_counter()  # Used to report how long startup took
 
 # Database file for decision tracking
 DB_FILE = "decisions.db"
@@ -54,8 +61,35 @@ load_dotenv()
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Initialize the OpenAI client
-client_ai = OpenAI(api_key=OPENAI_API_KEY)
+# OpenAI client, created by init_bot()
+client_ai = None
+
+def format_choose_hint(prefix, count):
+    """
+    List the choose commands for an adventure (e.g., "`!choose 1`, `!choose 2`, or `!choose 3`").
+    """
+    options = [f"`{prefix}choose {i}`" for i in range(1, count + 1)]
+    if len(options) <= 2:
+        return " or ".join(options)
+    return ", ".join(options[:-1]) + f", or {options[-1]}"
+
+def parse_scenario(scenario):
+    """
+    Split an AI-generated scenario into the adventure text, its numbered choices, and its tags.
+    """
+    adventure_text_lines = []
+    extracted_choices = []
+    choice_pattern = re.compile(r"^\d+\.\s*(.*)")  # Matches choices like "1. Choice text"
+
+    for line in scenario.split("\n"):
+        match = choice_pattern.match(line.strip())
+        if match:
+            extracted_choices.append(match.group(1).strip())
+        else:
+            adventure_text_lines.append(line.strip())
+
+    adventure_text, tags = library.extract_tags("\n".join(adventure_text_lines))
+    return adventure_text, [choice for choice in extracted_choices if choice], tags
 
 def generate_ai_response(prompt, model="gpt-3.5-turbo"):
     """
@@ -76,10 +110,28 @@ def generate_ai_response(prompt, model="gpt-3.5-turbo"):
         print(f"❌ Error with OpenAI API: {e}")
         return "⚠️ AI response error. Try again later."
 
+async def generate_ai_response_async(prompt, model="gpt-3.5-turbo"):
+    """
+    Run generate_ai_response() in a worker thread so slow API calls don't block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, generate_ai_response, prompt, model)
+
+# `!` prefix commands stay available during the migration to slash commands.
+# Set PREFIX_COMMANDS=false once every guild uses slash commands, so the bot stops
+# receiving (and reading) every message.
+PREFIX_COMMANDS = os.getenv("PREFIX_COMMANDS", "true").lower() != "false"
+
+# Set SYNC_COMMANDS=true for one start after adding or changing slash commands.
+# Syncing is rate-limited by Discord, so it is not done on every startup.
+SYNC_COMMANDS = os.getenv("SYNC_COMMANDS", "false").lower() == "true"
+
 # Set up Discord bot intents and initialize the client
 intents = discord.Intents.default()
-intents.message_content = True  # Allow the bot to read message content
+intents.message_content = PREFIX_COMMANDS  # Allow the bot to read message content
+intents.messages = PREFIX_COMMANDS         # Slash commands arrive as interactions, not messages
 client = discord.Client(intents=intents)
+tree = app_commands.CommandTree(client)
 
 # ------------------ Cooldown and Caching Setup ------------------
 
@@ -111,6 +163,7 @@ def set_cooldown(user_id, command, cooldown_time):
 scenario_cache = {}        # Stores adventures with timestamps
 CACHE_EXPIRY_TIME = 300      # Cache expiry time in seconds (5 minutes)
 current_choices = {}         # Stores the current adventure choices for each user
+LIBRARY_GENERATION_RATE = 0.2  # Share of !adventure requests that generate anyway to grow the library
 
 # ------------------ Player Data Management ------------------
 
@@ -136,6 +189,58 @@ def load_players():
     else:
         player_stats = {}
 
+# Predefined fantasy names for random generation
+FANTASY_NAMES = [
+    "Aether", "Breeze", "Cinder", "Dawn", "Echo", "Frost", "Glimmer", "Haven",
+    "Ink", "Jade", "Kindle", "Lumen", "Mist", "Nova", "Onyx", "Pulse", "Quill",
+    "Rune", "Shade", "Tempest", "Umbra", "Veridian", "Whisper", "Xylos", "Yield",
+    "Zenith", "Amber", "Blaze", "Cascade", "Drift", "Ember", "Flare", "Gale",
+    "Horizon", "Iron", "Journey", "Keystone", "Lunar", "Mirage", "Nexus",
+    "Oracle", "Path", "Quartz", "Ripple", "Spark", "Twilight", "Unity",
+    "Vortex", "Wisp", "Xenon", "Yearn", "Zeal"
+]
+
+def roll_ability_scores():
+    """
+    Roll a new character's ability scores and HP (10 + Constitution modifier).
+
+    Returns:
+        tuple: (ability scores dict, HP)
+    """
+    ability_scores = {
+        "Strength": random.randint(3, 18),
+        "Dexterity": random.randint(3, 18),
+        "Constitution": random.randint(3, 18),
+        "Intelligence": random.randint(3, 18),
+        "Wisdom": random.randint(3, 18),
+        "Charisma": random.randint(3, 18)
+    }
+    con_modifier = (ability_scores["Constitution"] - 10) // 2
+    return ability_scores, max(10 + con_modifier, 1)
+
+def create_character(user_id_str, name, race, character_class, ability_scores, hp, skills):
+    """
+    Store a newly registered character and save it to disk.
+    """
+    player_stats[user_id_str] = {
+        "Name": name,
+        "Race": race,
+        "Class": character_class,
+        **ability_scores,
+        "HP": hp,
+        "proficiencies": skills,
+        "history": []
+    }
+    save_players()
+
+def retire_character(user_id_str):
+    """
+    Move a player's character to the graveyard and remove it from active play.
+    """
+    save_to_graveyard(user_id_str, player_stats[user_id_str])
+    del player_stats[user_id_str]
+    save_players()
+
 def save_to_graveyard(user_id, character_data):
     """
     Saves deleted character data to a separate file (graveyard.json) before removing it from active play.
@@ -153,79 +258,184 @@ def save_to_graveyard(user_id, character_data):
     with open(GRAVEYARD_FILE, "w") as f:
         json.dump(graveyard, f, indent=4)
 
-# Load player data when the bot starts
-load_players()
+# ------------------ Session Checkpointing ------------------
+
+SESSION_FILE = "sessions.json"
+CHECKPOINT_INTERVAL = 60     # Seconds between periodic checkpoints
+MAX_DOWNTIME_CREDIT = 600    # Most downtime (in seconds) refunded to cached adventures on restore
+_last_checkpoint = None      # Last state written, to skip unchanged checkpoints
+
+def save_sessions():
+    """
+    Checkpoint cached adventures, current choices, and cooldowns to a JSON file.
+    The file is written to a temporary path and swapped in, so a crash mid-write
+    never leaves a corrupt checkpoint. Skips the write if nothing changed.
+
+    Returns:
+        bool: True if a checkpoint was written.
+    """
+    global _last_checkpoint
+    state = {
+        "scenario_cache": scenario_cache,
+        "current_choices": current_choices,
+        "cooldowns": cooldowns
+    }
+    snapshot = json.dumps(state)
+    if snapshot == _last_checkpoint:
+        return False
+
+    temp_file = SESSION_FILE + ".tmp"
+    with open(temp_file, "w") as f:
+        json.dump({"saved_at": time.time(), **state}, f)
+    os.replace(temp_file, SESSION_FILE)
+    _last_checkpoint = snapshot
+    return True
+
+def load_sessions():
+    """
+    Restore session state from the last checkpoint if it exists.
+    Cached adventures get back up to MAX_DOWNTIME_CREDIT seconds of the time the bot
+    was down, so a quick restart doesn't expire them; expired cooldowns are dropped.
+    """
+    if not os.path.exists(SESSION_FILE):
+        return
+
+    start = time.perf_counter()
+    try:
+        with open(SESSION_FILE, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error loading {SESSION_FILE}: {e}")
+        return
+
+    now = time.time()
+    downtime = max(now - data.get("saved_at", now), 0)
+    credit = min(downtime, MAX_DOWNTIME_CREDIT)
+
+    for user_id_str, entry in data.get("scenario_cache", {}).items():
+        entry["timestamp"] += credit
+        if now - entry["timestamp"] < CACHE_EXPIRY_TIME:
+            scenario_cache[user_id_str] = entry
+
+    current_choices.update(data.get("current_choices", {}))
+
+    # JSON turns the integer user IDs used by cooldowns into strings
+    for user_id_str, commands in data.get("cooldowns", {}).items():
+        active = {command: expires for command, expires in commands.items() if expires > now}
+        if active:
+            cooldowns[int(user_id_str)] = active
+
+    print(
+        f"♻️ Restored {len(scenario_cache)} cached adventures and {len(current_choices)} active choices "
+        f"after {downtime:.0f}s downtime in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+background_tasks = set()     # Running background tasks (the event loop only keeps weak references)
+
+def start_background_task(coro):
+    """
+    Start a task and keep a reference to it until it finishes, so it can't be
+    garbage-collected partway through (e.g., mid-checkpoint).
+    """
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def checkpoint_loop():
+    """
+    Periodically checkpoint session state while the bot is running.
+    """
+    while not client.is_closed():
+        await asyncio.sleep(CHECKPOINT_INTERVAL)
+        save_sessions()
+
+async def shutdown():
+    """
+    Checkpoint session state and close the bot (used for SIGTERM).
+    """
+    start = time.perf_counter()
+    save_sessions()
+    print(f"💾 Checkpointed sessions in {(time.perf_counter() - start) * 1000:.1f}ms")
+    await client.close()
+    print(f"👋 Shutdown took {time.perf_counter() - start:.2f}s")
+
+def init_bot():
+    """
+    Create the OpenAI client and load player data, the race/class/skill index, saved
+    sessions, and the adventure library. Called once from the __main__ block before the
+    bot connects, so importing this module (as the simulator's worker processes do) has
+    no side effects.
+    """
+    global client_ai
+    client_ai = OpenAI(api_key=OPENAI_API_KEY)
+    load_players()
+    content.init_content()
+    load_sessions()
+    init_db()  # Initialize the decision tracking database
+    library.init_library(DB_FILE)  # Create the adventure library tables and near-duplicate index
 
 # ------------------ Discord Bot Event Handlers ------------------
 
+@client.event
+async def setup_hook():
+    """
+    Runs once before the bot connects: starts periodic checkpoints and SIGTERM handling,
+    and syncs slash commands if SYNC_COMMANDS is set.
+    """
+    start_background_task(checkpoint_loop())
+    start_background_task(content.watch_content())  # Hot-reload content.json off the event loop
+    if SYNC_COMMANDS:
+        try:
+            synced = await tree.sync()  # Register slash commands with Discord
+            print(f"✅ Synced {len(synced)} slash commands")
+        except discord.HTTPException as e:
+            print(f"❌ Error syncing slash commands: {e}")
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: start_background_task(shutdown()))
+    except NotImplementedError:
+        pass  # Not supported on Windows; sessions are still checkpointed when client.run() returns
+
 @client.event
 async def on_ready():
     """
     Event handler for when the bot successfully logs in.
     """
-    init_db()  # Initialize the decision tracking database
-    print(f'✅ Logged in as {client.user}')
+    print(f'✅ Logged in as {client.user} ({time.perf_counter() - STARTUP_TIME:.2f}s since startup)')
 
 @client.event
 async def on_message(message):
     """
-    Main event handler for incoming messages.
+    Event handler for incoming messages. Only received while PREFIX_COMMANDS is enabled.
+    """
+    await handle_command(message)
+
+async def handle_command(message):
+    """
+    Main handler for `!` commands, shared by prefix messages and slash commands.
     Handles commands: !register, !stats, !roll d20, !adventure, and !choose.
     """
     if message.author == client.user:
         return  # Ignore messages sent by the bot itself
 
     user_id = message.author.id
+    prefix = getattr(message, "prefix", "!")  # "/" for slash commands, used in help hints
 
     # ----- PLAYER REGISTRATION: !register -----
 
-    # Predefined fantasy names, races, and classes for random generation
-    FANTASY_NAMES = [
-        "Aether", "Breeze", "Cinder", "Dawn", "Echo", "Frost", "Glimmer", "Haven",
-        "Ink", "Jade", "Kindle", "Lumen", "Mist", "Nova", "Onyx", "Pulse", "Quill",
-        "Rune", "Shade", "Tempest", "Umbra", "Veridian", "Whisper", "Xylos", "Yield",
-        "Zenith", "Amber", "Blaze", "Cascade", "Drift", "Ember", "Flare", "Gale",
-        "Horizon", "Iron", "Journey", "Keystone", "Lunar", "Mirage", "Nexus",
-        "Oracle", "Path", "Quartz", "Ripple", "Spark", "Twilight", "Unity",
-        "Vortex", "Wisp", "Xenon", "Yearn", "Zeal"
-    ]
-
-    RACES = [
-        "Dragonborn", "Dwarf", "Elf", "Gnome", "Half-Elf", "Halfling", "Half-Orc", "Human",
-        "Tiefling", "Aarakocra", "Aasimar", "Bugbear", "Centaur", "Changeling",
-        "Deep Gnome (Svirfneblin)", "Firbolg", "Genasi (Air)", "Genasi (Earth)",
-        "Genasi (Fire)", "Genasi (Water)", "Gith (Githyanki)", "Gith (Githzerai)",
-        "Goblin", "Goliath", "Grung", "Harengon", "Hobgoblin", "Kalashtar", "Kenku",
-        "Kobold", "Lizardfolk", "Loxodon", "Minotaur", "Orc", "Owlin", "Rabbitfolk",
-        "Reborn", "Satyr", "Sea Elf", "Shadar-kai", "Shifter", "Simic Hybrid", "Tabaxi",
-        "Tortle", "Triton", "Vedalken", "Verdan", "Warforged", "Yuan-ti Pureblood"
-    ]
-
-    CLASSES = [
-        "Barbarian", "Bard", "Cleric", "Druid", "Fighter", "Monk", "Paladin", "Ranger",
-        "Rogue", "Sorcerer", "Warlock", "Wizard", "Artificer"
-    ]
+    # Races, classes, and skills are loaded from content.json (see content.py)
+    RACES = content.names("races")
+    CLASSES = content.names("classes")
 
     if message.content.startswith("!register"):
         user_id_str = str(message.author.id)
 
         if user_id_str in player_stats:
-            await message.channel.send("✅ You are already registered! Use `!stats` to view your stats.")
+            await message.channel.send(f"✅ You are already registered! Use `{prefix}stats` to view your stats.")
             return
 
-        # Step 1: Generate ability scores
-        ability_scores = {
-            "Strength": random.randint(3, 18),
-            "Dexterity": random.randint(3, 18),
-            "Constitution": random.randint(3, 18),
-            "Intelligence": random.randint(3, 18),
-            "Wisdom": random.randint(3, 18),
-            "Charisma": random.randint(3, 18)
-        }
-
-        # Calculate HP based on Constitution modifier
-        con_modifier = (ability_scores["Constitution"] - 10) // 2
-        hp = max(10 + con_modifier, 1)
+        # Step 1: Generate ability scores and HP
+        ability_scores, hp = roll_ability_scores()
 
         def format_ability_scores():
             return (
@@ -264,7 +474,11 @@ async def on_message(message):
         # Step 3: Choose Race
         try:
             race_response = await client.wait_for("message", check=check, timeout=30.0)
-            character_race = race_response.content.strip().title() if race_response.content.lower() != "random" else random.choice(RACES)
+            character_race = content.lookup("races", race_response.content) if race_response.content.lower() != "random" else random.choice(RACES)
+
+            if character_race is None:
+                character_race = random.choice(RACES)
+                await message.channel.send(f"❓ Unknown race `{race_response.content.strip()}`. The dice chose **{character_race}** for you!")
 
         except asyncio.TimeoutError:
             character_race = random.choice(RACES)
@@ -277,7 +491,11 @@ async def on_message(message):
         # Step 4: Choose Class
         try:
             class_response = await client.wait_for("message", check=check, timeout=30.0)
-            character_class = class_response.content.strip().title() if class_response.content.lower() != "random" else random.choice(CLASSES)
+            character_class = content.lookup("classes", class_response.content) if class_response.content.lower() != "random" else random.choice(CLASSES)
+
+            if character_class is None:
+                character_class = random.choice(CLASSES)
+                await message.channel.send(f"❓ Unknown class `{class_response.content.strip()}`. The dice chose **{character_class}** for you!")
 
         except asyncio.TimeoutError:
             character_class = random.choice(CLASSES)
@@ -285,40 +503,30 @@ async def on_message(message):
         await message.channel.send(
             f"🎭 You are now **{character_name} the {character_race} {character_class}**!\n"
             "Lastly, choose **3 skills** for proficiency from the following list:\n"
-            "`acrobatics, animal handling, arcana, athletics, deception, history, insight, intimidation, investigation, medicine, nature, perception, performance, persuasion, religion, sleight of hand, stealth, survival`"
+            f"`{', '.join(content.names('skills'))}`"
             "\nReply with **3 skills** separated by commas (e.g., `stealth, perception, athletics`)."
         )
 
         # Step 5: Choose Proficiencies
         try:
             response = await client.wait_for("message", check=check, timeout=60.0)
-            chosen_skills = [skill.strip().lower() for skill in response.content.split(",")]
+            chosen_skills = [content.lookup("skills", skill) for skill in response.content.split(",")]
 
-            if len(chosen_skills) != 3:
-                await message.channel.send("❌ Invalid selection! Restart `!register` and choose **exactly 3 skills**.")
+            if len(chosen_skills) != 3 or None in chosen_skills or len(set(chosen_skills)) != 3:
+                await message.channel.send(f"❌ Invalid selection! Restart `{prefix}register` and choose **exactly 3 skills** from the list.")
                 return
 
         except asyncio.TimeoutError:
-            await message.channel.send("⏳ Registration timed out! Run `!register` again.")
+            await message.channel.send(f"⏳ Registration timed out! Run `{prefix}register` again.")
             return
 
         # Store player data
-        player_stats[user_id_str] = {
-            "Name": character_name,
-            "Race": character_race,
-            "Class": character_class,
-            **ability_scores,
-            "HP": hp,
-            "proficiencies": chosen_skills,
-            "history": []
-        }
-
-        save_players()
+        create_character(user_id_str, character_name, character_race, character_class, ability_scores, hp, chosen_skills)
 
         await message.channel.send(
             f"🎉 **Registration Complete!**\n"
             f"🏰 **{character_name} the {character_race} {character_class}** has been created!\n"
-            "Use `!stats` to view your full character details!"
+            f"Use `{prefix}stats` to view your full character details!"
         )
 
     # ----- RESET PLAYER STATS: !reset -----
@@ -342,23 +550,19 @@ async def on_message(message):
             user_input = response.content.lower()
 
             if user_input == "confirm":
-                # Save character to the graveyard before deleting
-                save_to_graveyard(user_id_str, player_stats[user_id_str])
-
-                # Delete character from active player stats
-                del player_stats[user_id_str]
-                save_players()
+                # Save character to the graveyard before deleting it from active play
+                retire_character(user_id_str)
 
                 await message.channel.send(
                     f"💀 Your character has been **deleted** and moved to the **Character Graveyard**.\n"
-                    "You can now use `!register` to start fresh!"
+                    f"You can now use `{prefix}register` to start fresh!"
                 )
         
             elif user_input == "cancel":
                 await message.channel.send("❌ Character reset **canceled**. Your character remains intact.")
 
             else:
-                await message.channel.send("❌ Invalid response! Reset **aborted**. Run `!reset` again if you still wish to delete your character.")
+                await message.channel.send(f"❌ Invalid response! Reset **aborted**. Run `{prefix}reset` again if you still wish to delete your character.")
 
         except asyncio.TimeoutError:
             await message.channel.send("⏳ Reset request timed out. Your character remains intact.")
@@ -368,7 +572,7 @@ async def on_message(message):
         user_id_str = str(message.author.id)
 
         if user_id_str not in player_stats:
-            await message.channel.send("❌ You are not registered! Use `!register` to create a character.")
+            await message.channel.send(f"❌ You are not registered! Use `{prefix}register` to create a character.")
             return
 
         stats = player_stats[user_id_str]
@@ -431,15 +635,20 @@ async def on_message(message):
 
     # ----- VIEW PLAYER SKILLS: !skills -----
     elif message.content.startswith("!skills"):
-        skill_list = (
-            "**Available Skills & Associated Abilities:**\n"
-            "🌀 Acrobatics (Dexterity) | 🐾 Animal Handling (Wisdom) | 📖 Arcana (Intelligence)\n"
-            "🏋️ Athletics (Strength) | 🎭 Deception (Charisma) | 🏛️ History (Intelligence)\n"
-            "👁️ Insight (Wisdom) | 😈 Intimidation (Charisma) | 🔍 Investigation (Intelligence)\n"
-            "🩺 Medicine (Wisdom) | 🌿 Nature (Intelligence) | 👀 Perception (Wisdom)\n"
-            "🎶 Performance (Charisma) | 🗣️ Persuasion (Charisma) | 🔥 Religion (Intelligence)\n"
-            "🤹 Sleight of Hand (Dexterity) | 🥷 Stealth (Dexterity) | 🏕️ Survival (Wisdom)\n\n"
-        )
+        # Built from content.json so homebrew skills are listed too
+        skill_entries = [
+            f"{content.info('skills', skill).get('emoji', '📜')} {skill.title().replace(' Of ', ' of ')} ({content.info('skills', skill)['ability']})"
+            for skill in content.names("skills")
+        ]
+        lines = [" | ".join(skill_entries[i:i + 3]) for i in range(0, len(skill_entries), 3)]
+
+        # Split long lists to stay under Discord's 2000-character message limit
+        skill_list = "**Available Skills & Associated Abilities:**"
+        for line in lines:
+            if len(skill_list) + len(line) + 1 > 2000:
+                await message.channel.send(skill_list)
+                skill_list = ""
+            skill_list += "\n" + line
         await message.channel.send(skill_list)
 
     # 🎲 DICE ROLL - !roll d20 with stat bonus integration
@@ -462,8 +671,8 @@ async def on_message(message):
             return
 
         # If an ability parameter is provided, validate and apply its modifier
-        ability = parts[2].capitalize()
-        if ability not in {"Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma"}:
+        ability = content.lookup("abilities", parts[2])
+        if ability is None:
             await message.channel.send("❌ Invalid ability specified. Choose from Strength, Dexterity, Constitution, Intelligence, Wisdom, or Charisma.")
             return
 
@@ -479,7 +688,7 @@ async def on_message(message):
             )
         else:
             await message.channel.send(
-                f"🎲 You rolled a **{roll}** (1d20)! Register with `!register` to gain stat bonuses."
+                f"🎲 You rolled a **{roll}** (1d20)! Register with `{prefix}register` to gain stat bonuses."
             )
 
 
@@ -489,7 +698,7 @@ async def on_message(message):
         cooldown_time = 10  # 10-second cooldown for adventure generation
         remaining = is_on_cooldown(user_id, "!adventure", cooldown_time)
         if remaining:
-            await message.channel.send(f"⏳ You must wait {remaining} seconds before using `!adventure` again.")
+            await message.channel.send(f"⏳ You must wait {remaining} seconds before using `{prefix}adventure` again.")
             return
 
         set_cooldown(user_id, "!adventure", cooldown_time)
@@ -510,7 +719,7 @@ async def on_message(message):
                     f"♻️ Using a recent adventure:\n\n"
                     f"📜 **Adventure Hook:**\n{adventure_text}\n\n"
                     f"⚔️ **Choices:**\n{formatted_choices}\n\n"
-                    f"Use `!choose 1`, `!choose 2`, or `!choose 3` to decide your action!"
+                    f"Use {format_choose_hint(prefix, len(choices))} to decide your action!"
                 )
                 await message.channel.send(adventure_message)
                 return  # Stop further processing if using cached adventure
@@ -518,35 +727,54 @@ async def on_message(message):
                 # Remove expired cache entry
                 del scenario_cache[user_id_str]
 
-        # Generate a new adventure if no valid cache exists
-        await message.channel.send("🎲 Generating a new adventure... please wait!")
-        prompt = "Generate a short D&D adventure hook with three choices."
-        scenario = generate_ai_response(prompt, model="gpt-3.5-turbo")
-
-        # Parse the AI-generated scenario into adventure text and choices
-        scenario_lines = scenario.split("\n")
-        adventure_text_lines = []
-        extracted_choices = []
-        choice_pattern = re.compile(r"^\d+\.\s*(.*)")  # Matches choices like "1. Choice text"
-
-        for line in scenario_lines:
-            match = choice_pattern.match(line.strip())
-            if match:
-                extracted_choices.append(match.group(1).strip())
-            else:
-                adventure_text_lines.append(line.strip())
+        # Serve an unseen adventure from the library when possible, optionally filtered by tags
+        # (e.g., `!adventure forest dark`). Some requests still generate to grow the library.
+        filters = message.content.split()[1:]
+        adventure = None
+        if random.random() >= LIBRARY_GENERATION_RATE:
+            adventure = library.find_adventure(user_id_str, filters)
 
-        adventure_text = "\n".join(adventure_text_lines).strip()
+        if adventure:
+            adventure_id, adventure_text, extracted_choices = adventure
+            await message.channel.send("📚 Pulling an adventure from the library...")
+        else:
+            await message.channel.send("🎲 Generating a new adventure... please wait!")
+            prompt = (
+                "Generate a short D&D adventure hook with three numbered choices. "
+                "On the last line, add `Tags: setting=<one word>, tone=<one word>, difficulty=<easy, medium, or hard>`."
+            )
+            if filters:
+                prompt += f" The adventure should fit these themes: {', '.join(filters)}."
+
+            # Near-duplicates aren't stored again; if the user already saw the original, try once more
+            adventure_id = None
+            for _ in range(2):
+                scenario = await generate_ai_response_async(prompt, model="gpt-3.5-turbo")
+                adventure_text, extracted_choices, tags = parse_scenario(scenario)
+                if len(extracted_choices) < 2:
+                    break  # Error or unparseable response; show it but keep it out of the library
+
+                duplicate_id = library.find_duplicate(adventure_text)
+                if duplicate_id is None:
+                    adventure_id = library.add_adventure(adventure_text, extracted_choices, tags)
+                    break
+                adventure_id = duplicate_id
+                if not library.has_seen(user_id_str, duplicate_id):
+                    break
+                prompt += " Make it clearly different from the usual hooks, with a new setting and premise."
+
+        if adventure_id is not None:
+            library.mark_seen(user_id_str, adventure_id)
 
         # Store the choices in a dictionary and update current choices
-        choice_dict = {str(i): choice for i, choice in enumerate(extracted_choices, 1) if choice}
+        choice_dict = {str(i): choice for i, choice in enumerate(extracted_choices, 1)}
         current_choices[user_id_str] = choice_dict
 
         formatted_choices = "\n".join([f"{i}️⃣ **{choice}**" for i, choice in enumerate(extracted_choices, 1)])
         adventure_message = (
             f"📜 **Adventure Hook:**\n{adventure_text}\n\n"
             f"⚔️ **Choices:**\n{formatted_choices}\n\n"
-            f"Use `!choose 1`, `!choose 2`, or `!choose 3` to decide your action!"
+            f"Use {format_choose_hint(prefix, len(extracted_choices))} to decide your action!"
         )
 
         # Cache the newly generated adventure
@@ -570,7 +798,7 @@ async def on_message(message):
 
         # Ensure there is an active adventure for the user
         if user_id_str not in current_choices:
-            await message.channel.send("❌ No active adventure! Use `!adventure` first.")
+            await message.channel.send(f"❌ No active adventure! Use `{prefix}adventure` first.")
             return
 
         # Extract the choice number from the message
@@ -606,10 +834,10 @@ async def on_message(message):
             Their d20 roll result was {dice_result}.
             Given the adventure context, generate a dynamic outcome based on this result.
             """
-            outcome = generate_ai_response(prompt, model="gpt-4")
+            outcome = await generate_ai_response_async(prompt, model="gpt-4")
             await message.channel.send(f"🔮 You chose: {chosen_action}\n🎲 Your roll: {dice_result}\n📝 **Outcome:** {outcome}")
         else:
-            await message.channel.send("❓ Please choose a valid option: `!choose 1`, `!choose 2`, or `!choose 3`.")
+            await message.channel.send(f"❓ Please choose a valid option: {format_choose_hint(prefix, len(current_choices[user_id_str]))}.")
     # ------------------- Context-Specific Roll Commands -------------------
 
     # Melee Attack Roll - uses Strength modifier
@@ -632,7 +860,7 @@ async def on_message(message):
             )
         else:
             await message.channel.send(
-                f"⚔️ **Attack Roll:** You rolled a **{roll}** (1d20)! Register with `!register` to gain stat bonuses."
+                f"⚔️ **Attack Roll:** You rolled a **{roll}** (1d20)! Register with `{prefix}register` to gain stat bonuses."
             )
 
     # Ranged Attack Roll - uses Dexterity modifier
@@ -655,7 +883,7 @@ async def on_message(message):
             )
         else:
             await message.channel.send(
-                f"🏹 **Ranged Attack Roll:** You rolled a **{roll}** (1d20)! Register with `!register` to gain stat bonuses."
+                f"🏹 **Ranged Attack Roll:** You rolled a **{roll}** (1d20)! Register with `{prefix}register` to gain stat bonuses."
             )
 
     # Saving Throw Roll - expects an ability parameter (e.g., !save Constitution)
@@ -668,10 +896,10 @@ async def on_message(message):
         set_cooldown(user_id, "!save", cooldown_time)
         parts = message.content.split()
         if len(parts) < 2:
-            await message.channel.send("❌ Please specify which saving throw to roll (e.g., `!save Constitution`).")
+            await message.channel.send(f"❌ Please specify which saving throw to roll (e.g., `{prefix}save Constitution`).")
             return
-        ability = parts[1].capitalize()
-        if ability not in {"Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma"}:
+        ability = content.lookup("abilities", parts[1])
+        if ability is None:
             await message.channel.send("❌ Invalid ability specified. Choose from Strength, Dexterity, Constitution, Intelligence, Wisdom, or Charisma.")
             return
         roll = random.randint(1, 20)
@@ -686,11 +914,11 @@ async def on_message(message):
             )
         else:
             await message.channel.send(
-                f"🛡️ **Saving Throw:** You rolled a **{roll}** (1d20)! Register with `!register` to gain stat bonuses."
+                f"🛡️ **Saving Throw:** You rolled a **{roll}** (1d20)! Register with `{prefix}register` to gain stat bonuses."
             )
 
     # Skill Check Roll - expects a skill parameter (e.g., !skill Stealth)
-    elif message.content.startswith("!skill"):
+    elif message.content.startswith("!skill") and not message.content.startswith("!skills"):
         cooldown_time = 3  # 3-second cooldown for skill checks
         remaining = is_on_cooldown(user_id, "!skill", cooldown_time)
         if remaining:
@@ -700,38 +928,16 @@ async def on_message(message):
 
         parts = message.content.split()
         if len(parts) < 2:
-            await message.channel.send("To roll a skill check, type `!skill <skill_name>` (e.g., `!skill Stealth`).")
+            await message.channel.send(f"To roll a skill check, type `{prefix}skill <skill_name>` (e.g., `{prefix}skill Stealth`).")
             return
 
-        # Skill-to-Ability Mapping (Based on D&D 5e rules)
-        skill_map = {
-            "acrobatics": "Dexterity",
-            "animal handling": "Wisdom",
-            "arcana": "Intelligence",
-            "athletics": "Strength",
-            "deception": "Charisma",
-            "history": "Intelligence",
-            "insight": "Wisdom",
-            "intimidation": "Charisma",
-            "investigation": "Intelligence",
-            "medicine": "Wisdom",
-            "nature": "Intelligence",
-            "perception": "Wisdom",
-            "performance": "Charisma",
-            "persuasion": "Charisma",
-            "religion": "Intelligence",
-            "sleight of hand": "Dexterity",
-            "stealth": "Dexterity",
-            "survival": "Wisdom",
-        }
-
-        # Extract skill name and normalize it
-        skill_input = " ".join(parts[1:]).lower()
-        if skill_input not in skill_map:
-            await message.channel.send("❌ Invalid skill specified. Use `!skills` to see the full list.")
+        # Resolve the skill name (prefixes and small typos are accepted) via content.json
+        skill_input = content.lookup("skills", " ".join(parts[1:]))
+        if skill_input is None:
+            await message.channel.send(f"❌ Invalid skill specified. Use `{prefix}skills` to see the full list.")
             return
 
-        ability = skill_map[skill_input]  # Get the associated ability score
+        ability = content.info("skills", skill_input)["ability"]  # Get the associated ability score
         roll = random.randint(1, 20)
         user_id_str = str(message.author.id)
 
@@ -745,9 +951,294 @@ async def on_message(message):
             )
         else:
             await message.channel.send(
-                f"📜 **Skill Check:** You rolled a **{roll}** (1d20)! Register with `!register` to gain stat bonuses."
+                f"📜 **Skill Check:** You rolled a **{roll}** (1d20)! Register with `{prefix}register` to gain stat bonuses."
             )
 
+    # Encounter Simulation - e.g., !simulate goblin 3, bugbear @friend
+    elif message.content.startswith("!simulate"):
+        cooldown_time = 30  # 30-second cooldown for encounter simulations
+        remaining = is_on_cooldown(user_id, "!simulate", cooldown_time)
+        if remaining:
+            await message.channel.send(f"⏳ You must wait {remaining} seconds before running another simulation.")
+            return
+
+        # Party: the author plus any mentioned players, all of whom must be registered
+        party_ids = [str(message.author.id)] + [str(member.id) for member in message.mentions if not member.bot]
+        unregistered = [uid for uid in party_ids if uid not in player_stats or "Name" not in player_stats[uid]]
+        if unregistered:
+            await message.channel.send(f"❌ Every party member must be registered with `{prefix}register` before simulating.")
+            return
+
+        # Monsters: comma-separated names with an optional count (e.g., `goblin 3` or `goblin x3`)
+        monster_text = re.sub(r"<@!?\d+>", "", message.content[len("!simulate"):])
+        specs = [spec.strip() for spec in monster_text.split(",") if spec.strip()]
+        if not specs:
+            await message.channel.send(f"To simulate an encounter, type `{prefix}simulate <monster> [count], ...` (e.g., `{prefix}simulate goblin 3, bugbear{' @friend' if prefix == '!' else ''}`).")
+            return
+
+        # Resolve names and counts first; only build the list once the total is known to be valid
+        encounter = []
+        for spec in specs:
+            match = re.match(r"^(.*?)(?:\s+x?(\d+))?$", spec)
+            monster_name = content.lookup("monsters", match.group(1))
+            if monster_name is None:
+                await message.channel.send(f"❌ Unknown monster `{match.group(1)}`. Available: {', '.join(content.names('monsters'))}.")
+                return
+            count = int(match.group(2) or 1)
+            if count < 1:
+                await message.channel.send(f"❌ Each monster needs a count of at least **1** (got `{spec}`).")
+                return
+            encounter.append((monster_name, count))
+
+        if sum(count for _, count in encounter) > 20:
+            await message.channel.send("❌ Encounters are limited to **20 monsters**.")
+            return
+
+        monsters = []
+        for monster_name, count in encounter:
+            try:
+                monster = simulator.combatant_from_monster(monster_name, content.info("monsters", monster_name))
+            except (KeyError, ValueError) as e:
+                await message.channel.send(f"❌ The stat block for **{monster_name}** in content.json is invalid ({e}).")
+                return
+            monsters.extend([monster] * count)
+
+        set_cooldown(user_id, "!simulate", cooldown_time)
+        party = [simulator.combatant_from_player(player_stats[uid]) for uid in party_ids]
+        await message.channel.send(f"⚔️ Simulating {simulator.DEFAULT_TRIALS:,} battles... please wait!")
+
+        # Run in a worker thread so the process pool doesn't block the event loop
+        loop = asyncio.get_running_loop()
+        try:
+            report = await loop.run_in_executor(None, simulator.run_simulation, party, monsters)
+        except Exception as e:
+            print(f"❌ Error running simulation: {e}")
+            await message.channel.send("⚠️ The simulation failed. Try again later.")
+            return
+
+        if report["trials"] == 0:
+            await message.channel.send("⏳ The simulation ran out of time. Try a smaller encounter.")
+            return
+
+        rounds = report["rounds_to_win"]
+        rounds_line = (
+            f"⏱️ Rounds to win: {rounds[1]:.0f} typical ({rounds[0]:.0f}–{rounds[2]:.0f})\n"
+            if rounds is not None else "⏱️ Rounds to win: the party never won.\n"
+        )
+        hp_lost = report["hp_lost"]
+        await message.channel.send(
+            f"📊 **Encounter Simulation** ({report['trials']:,} battles in {report['elapsed']:.1f}s)\n"
+            f"🛡️ Party: {', '.join(member['name'] for member in party)}\n"
+            f"👹 Monsters: {', '.join(monster['name'] for monster in monsters)}\n"
+            f"🏆 Party win rate: **{report['win_rate']:.1%}**\n"
+            f"{rounds_line}"
+            f"❤️ Party HP lost: {hp_lost[1]:.0%} typical ({hp_lost[0]:.0%}–{hp_lost[2]:.0%})"
+        )
+
+# ------------------ Slash Commands ------------------
+
+class SlashMessage:
+    """
+    Presents a slash command to handle_command() as if it were a `!` message.
+    The first reply answers the interaction; later replies (or replies after a
+    defer) are sent as follow-ups.
+    """
+
+    def __init__(self, interaction, content, mentions=()):
+        self.interaction = interaction
+        self.content = content
+        self.author = interaction.user
+        self.mentions = list(mentions)
+        self.channel = self
+        self.prefix = "/"  # Help hints name slash commands
+
+    async def send(self, text):
+        if self.interaction.response.is_done():
+            await self.interaction.followup.send(text)
+        else:
+            await self.interaction.response.send_message(text)
+
+@tree.error
+async def on_app_command_error(interaction, error):
+    """
+    Reply when a slash command fails, so a deferred command doesn't stay on "thinking..."
+    until Discord times it out.
+    """
+    print(f"❌ Error in /{interaction.command.name if interaction.command else '?'}: {error}")
+    try:
+        await SlashMessage(interaction, "").send("⚠️ Something went wrong with that command. Try again later.")
+    except discord.HTTPException:
+        pass  # The interaction may already have expired
+
+async def run_slash_command(interaction, content, mentions=(), defer=False):
+    """
+    Run a `!` command for a slash command interaction.
+
+    Args:
+        interaction (discord.Interaction): The slash command interaction.
+        content (str): The equivalent `!` command text.
+        mentions (list): Members to treat as mentioned in the command.
+        defer (bool): Acknowledge right away for commands that wait on the AI or the
+            simulator, so Discord's 3-second response window doesn't expire.
+    """
+    if defer:
+        await interaction.response.defer(thinking=True)
+    await handle_command(SlashMessage(interaction, content, mentions))
+
+async def autocomplete_from(category, current):
+    """
+    Suggest up to 25 content.json entries (Discord's limit) matching what the user has typed.
+    """
+    typed = content.normalize(current)
+    matches = [name for name in content.names(category) if typed in content.normalize(name)]
+    return [app_commands.Choice(name=name, value=name) for name in matches[:25]]
+
+async def race_autocomplete(interaction, current):
+    return await autocomplete_from("races", current)
+
+async def class_autocomplete(interaction, current):
+    return await autocomplete_from("classes", current)
+
+async def skill_autocomplete(interaction, current):
+    return await autocomplete_from("skills", current)
+
+async def monster_autocomplete(interaction, current):
+    # Complete only the last monster in a comma-separated list, keeping the earlier ones
+    earlier, _, last = current.rpartition(",")
+    prefix = f"{earlier}, " if earlier else ""
+    suggestions = await autocomplete_from("monsters", last)
+    return [app_commands.Choice(name=f"{prefix}{choice.name}"[:100], value=f"{prefix}{choice.value}"[:100]) for choice in suggestions]
+
+# Built at import time (before content.json is loaded), so the six abilities are listed here
+ABILITY_CHOICES = [
+    app_commands.Choice(name=ability, value=ability)
+    for ability in ("Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma")
+]
+
+@tree.command(name="register", description="Create a character (blank options are chosen at random)")
+@app_commands.rename(character_class="class")
+@app_commands.autocomplete(race=race_autocomplete, character_class=class_autocomplete,
+                           skill_1=skill_autocomplete, skill_2=skill_autocomplete, skill_3=skill_autocomplete)
+async def slash_register(interaction: discord.Interaction, skill_1: str, skill_2: str, skill_3: str,
+                         name: str = None, race: str = None, character_class: str = None):
+    user_id_str = str(interaction.user.id)
+    if user_id_str in player_stats:
+        await interaction.response.send_message("✅ You are already registered! Use `/stats` to view your stats.")
+        return
+
+    chosen_skills = [content.lookup("skills", skill) for skill in (skill_1, skill_2, skill_3)]
+    if None in chosen_skills or len(set(chosen_skills)) != 3:
+        await interaction.response.send_message("❌ Invalid selection! Choose **3 different skills** from the list (see `/skills`).")
+        return
+
+    # Blank or `random` options are rolled; unknown races/classes are rolled too, with a notice
+    notices = ""
+    character_name = name.strip().title() if name and name.strip() else random.choice(FANTASY_NAMES)
+
+    requested_race = race.strip() if race else ""
+    character_race = content.lookup("races", requested_race) if requested_race.lower() not in ("", "random") else None
+    if character_race is None:
+        character_race = random.choice(content.names("races"))
+        if requested_race.lower() not in ("", "random"):
+            notices += f"❓ Unknown race `{requested_race}`. The dice chose **{character_race}** for you!\n"
+
+    requested_class = character_class.strip() if character_class else ""
+    character_class = content.lookup("classes", requested_class) if requested_class.lower() not in ("", "random") else None
+    if character_class is None:
+        character_class = random.choice(content.names("classes"))
+        if requested_class.lower() not in ("", "random"):
+            notices += f"❓ Unknown class `{requested_class}`. The dice chose **{character_class}** for you!\n"
+
+    ability_scores, hp = roll_ability_scores()
+    create_character(user_id_str, character_name, character_race, character_class, ability_scores, hp, chosen_skills)
+
+    await interaction.response.send_message(
+        f"{notices}"
+        f"🎉 **Registration Complete!**\n"
+        f"🏰 **{character_name} the {character_race} {character_class}** has been created!\n\n"
+        f"💪 Strength: {ability_scores['Strength']}\n"
+        f"🏹 Dexterity: {ability_scores['Dexterity']}\n"
+        f"🛡️ Constitution: {ability_scores['Constitution']}\n"
+        f"🧠 Intelligence: {ability_scores['Intelligence']}\n"
+        f"👁️ Wisdom: {ability_scores['Wisdom']}\n"
+        f"🗣️ Charisma: {ability_scores['Charisma']}\n"
+        f"❤️ HP: {hp}\n"
+        f"🎖️ Proficiencies: {', '.join(chosen_skills).title()}"
+    )
+
+@tree.command(name="reset", description="Permanently delete your character (moves it to the graveyard)")
+async def slash_reset(interaction: discord.Interaction, confirm: bool):
+    user_id_str = str(interaction.user.id)
+    if user_id_str not in player_stats:
+        await interaction.response.send_message("❌ You do not have a registered character to reset.")
+        return
+    if not confirm:
+        await interaction.response.send_message("❌ Character reset **canceled**. Your character remains intact.")
+        return
+
+    retire_character(user_id_str)
+    await interaction.response.send_message(
+        f"💀 Your character has been **deleted** and moved to the **Character Graveyard**.\n"
+        "You can now use `/register` to start fresh!"
+    )
+
+@tree.command(name="stats", description="View your character's stats")
+async def slash_stats(interaction: discord.Interaction):
+    await run_slash_command(interaction, "!stats")
+
+@tree.command(name="graveyard", description="View your last deleted character")
+async def slash_graveyard(interaction: discord.Interaction):
+    await run_slash_command(interaction, "!graveyard")
+
+@tree.command(name="skills", description="List all skills and their linked abilities")
+async def slash_skills(interaction: discord.Interaction):
+    await run_slash_command(interaction, "!skills")
+
+@tree.command(name="roll", description="Roll a d20, optionally adding an ability modifier")
+@app_commands.choices(ability=ABILITY_CHOICES)
+async def slash_roll(interaction: discord.Interaction, ability: app_commands.Choice[str] = None):
+    await run_slash_command(interaction, f"!roll d20 {ability.value}" if ability else "!roll d20")
+
+@tree.command(name="attack", description="Roll a melee attack (Strength modifier)")
+async def slash_attack(interaction: discord.Interaction):
+    await run_slash_command(interaction, "!attack")
+
+@tree.command(name="ranged", description="Roll a ranged attack (Dexterity modifier)")
+async def slash_ranged(interaction: discord.Interaction):
+    await run_slash_command(interaction, "!ranged")
+
+@tree.command(name="save", description="Roll a saving throw")
+@app_commands.choices(ability=ABILITY_CHOICES)
+async def slash_save(interaction: discord.Interaction, ability: app_commands.Choice[str]):
+    await run_slash_command(interaction, f"!save {ability.value}")
+
+@tree.command(name="skill", description="Roll a skill check")
+@app_commands.autocomplete(skill=skill_autocomplete)
+async def slash_skill(interaction: discord.Interaction, skill: str):
+    await run_slash_command(interaction, f"!skill {skill}")
+
+@tree.command(name="adventure", description="Start an adventure, optionally filtered by setting, tone, or difficulty")
+@app_commands.describe(tags="e.g., forest dark hard")
+async def slash_adventure(interaction: discord.Interaction, tags: str = ""):
+    await run_slash_command(interaction, f"!adventure {tags}".strip(), defer=True)
+
+@tree.command(name="choose", description="Choose an option in your current adventure")
+async def slash_choose(interaction: discord.Interaction, choice: app_commands.Range[int, 1, 9]):
+    await run_slash_command(interaction, f"!choose {choice}", defer=True)
+
+@tree.command(name="simulate", description="Simulate an encounter against your party")
+@app_commands.describe(monsters="Monsters with optional counts, e.g., goblin 3, bugbear")
+@app_commands.autocomplete(monsters=monster_autocomplete)
+async def slash_simulate(interaction: discord.Interaction, monsters: str, ally_1: discord.Member = None,
+                         ally_2: discord.Member = None, ally_3: discord.Member = None):
+    allies = [ally for ally in (ally_1, ally_2, ally_3) if ally]
+    await run_slash_command(interaction, f"!simulate {monsters}", mentions=allies, defer=True)
+
 # ------------------ Run the Discord Bot ------------------
 
-client.run(DISCORD_TOKEN)
+# Guarded so simulator worker processes can import this module without starting the bot
+# or loading any state
+if __name__ == "__main__":
+    init_bot()  # Load state before any events are handled
+    client.run(DISCORD_TOKEN)
+    save_sessions()  # Final checkpoint after a normal close or Ctrl+C
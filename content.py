@@ -0,0 +1,247 @@
+import asyncio
+import json
+import os
+import re
+
+# Data file holding the races, classes, skills, and abilities the bot recognizes
+CONTENT_FILE = "content.json"
+RELOAD_CHECK_INTERVAL = 5  # Seconds between checks for edits to the content file
+
+MAX_EDIT_DISTANCE = 2      # Largest typo (in edits) that lookups will correct
+
+# Fields every entry in a category must define
+REQUIRED_FIELDS = {
+    "skills": ["ability"]
+}
+
+_AMBIGUOUS = object()  # Trie marker for prefixes shared by more than one entry
+
+
+def normalize(text):
+    """
+    Normalize user input or content names for matching.
+    Lowercases, treats hyphens/underscores as spaces, and drops parentheses.
+    """
+    text = re.sub(r"[-_]", " ", text.lower())
+    text = re.sub(r"[()]", "", text)
+    return " ".join(text.split())
+
+
+def edit_distance(a, b):
+    """
+    Compute the Levenshtein distance between two strings.
+    """
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def deletion_variants(key, max_deletes=MAX_EDIT_DISTANCE):
+    """
+    Return every string reachable from `key` by deleting up to `max_deletes` characters.
+    Two strings within N edits always share a variant, so comparing variant sets
+    finds typo candidates without scanning the whole index.
+    """
+    variants = {key}
+    frontier = {key}
+    for _ in range(max_deletes):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+class PrefixTrie:
+    """
+    Trie over normalized keys. Each node remembers the single entry reachable
+    below it (or that several are), so prefix lookups cost O(len(prefix)).
+    """
+
+    def __init__(self):
+        self.root = self._new_node()
+
+    @staticmethod
+    def _new_node():
+        return {"children": {}, "match": None}
+
+    def insert(self, key, canonical):
+        node = self.root
+        for char in key:
+            self._mark(node, canonical)
+            node = node["children"].setdefault(char, self._new_node())
+        self._mark(node, canonical)
+
+    @staticmethod
+    def _mark(node, canonical):
+        if node["match"] is None:
+            node["match"] = canonical
+        elif node["match"] != canonical:
+            node["match"] = _AMBIGUOUS
+
+    def unique_prefix_match(self, prefix):
+        """
+        Return the only entry starting with `prefix`, or None if there are zero or several.
+        """
+        node = self.root
+        for char in prefix:
+            node = node["children"].get(char)
+            if node is None:
+                return None
+        return None if node["match"] is _AMBIGUOUS else node["match"]
+
+
+def _build_category(category, entries):
+    """
+    Build the lookup structures for one content category.
+
+    Args:
+        category (str): The category name, used to check REQUIRED_FIELDS.
+        entries (dict | list): Canonical names, optionally mapped to {"aliases": [...], ...}.
+
+    Raises:
+        ValueError: If an entry is missing a required field.
+    """
+    if isinstance(entries, list):
+        entries = {name: {} for name in entries}
+
+    for name, info in entries.items():
+        missing = [field for field in REQUIRED_FIELDS.get(category, []) if field not in info]
+        if missing:
+            raise ValueError(f"{category} entry '{name}' is missing {', '.join(missing)}")
+
+    exact, trie, deletions = {}, PrefixTrie(), {}
+    for name, info in entries.items():
+        for key in [name] + list(info.get("aliases", [])):
+            key = normalize(key)
+            exact.setdefault(key, name)
+            trie.insert(key, name)
+            for variant in deletion_variants(key):
+                deletions.setdefault(variant, set()).add(key)
+
+    max_key_length = max((len(key) for key in exact), default=0)
+    return {"entries": entries, "exact": exact, "trie": trie, "deletions": deletions, "max_key_length": max_key_length}
+
+
+def load_content(path=CONTENT_FILE):
+    """
+    Load the content file and build an index for every category in it.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {category: _build_category(category, entries) for category, entries in data.items()}
+
+
+# ------------------ Shared Index With Hot Reload ------------------
+
+content_index = {}
+_content_mtime = None
+
+
+def init_content(path=CONTENT_FILE):
+    """
+    Build the content index once at startup.
+    """
+    global content_index, _content_mtime
+    content_index = load_content(path)
+    _content_mtime = os.path.getmtime(path)
+
+
+def reload_if_changed(path=CONTENT_FILE):
+    """
+    Rebuild the index if the content file was edited since it was last loaded.
+    The new index is built in full and then swapped in with a single assignment,
+    so lookups running meanwhile keep using the old one. A broken file is
+    reported and the previous index is kept.
+    """
+    global content_index, _content_mtime
+    try:
+        mtime = os.path.getmtime(path)
+        if mtime == _content_mtime:
+            return
+        new_index = load_content(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error reloading {path}: {e}")
+        return
+    content_index = new_index
+    _content_mtime = mtime
+    print(f"🔄 Reloaded {path}")
+
+
+async def watch_content(path=CONTENT_FILE):
+    """
+    Background task that checks the content file every RELOAD_CHECK_INTERVAL seconds.
+    Rebuilding a large index takes a while, so it runs in a worker thread
+    instead of blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(RELOAD_CHECK_INTERVAL)
+        await loop.run_in_executor(None, reload_if_changed, path)
+
+
+def lookup(category, text):
+    """
+    Resolve user input to a canonical entry in a content category.
+    Tries an exact name or alias, then a unique prefix (e.g., `dex`, `sleight`),
+    then the closest spelling within a small edit distance.
+
+    Args:
+        category (str): "abilities", "skills", "races", or "classes".
+        text (str): The raw user input.
+
+    Returns:
+        str | None: The canonical name, or None if nothing (or nothing unique) matches.
+    """
+    index = content_index.get(category)
+    query = normalize(text)
+    if not index or not query:
+        return None
+
+    if query in index["exact"]:
+        return index["exact"][query]
+
+    match = index["trie"].unique_prefix_match(query)
+    if match is not None:
+        return match
+
+    max_distance = 1 if len(query) <= 4 else MAX_EDIT_DISTANCE
+    if len(query) > index["max_key_length"] + max_distance:
+        return None  # Too long to be a typo of any entry; also bounds the variant count
+
+    candidates = set()
+    for variant in deletion_variants(query, max_distance):
+        candidates |= index["deletions"].get(variant, set())
+
+    best, closest = max_distance, set()
+    for key in candidates:
+        distance = edit_distance(query, key)
+        if distance > max_distance:
+            continue
+        if not closest or distance < best:
+            best, closest = distance, {index["exact"][key]}
+        elif distance == best:
+            closest.add(index["exact"][key])
+    return closest.pop() if len(closest) == 1 else None
+
+
+def names(category):
+    """
+    Return every canonical name in a content category.
+    """
+    index = content_index.get(category)
+    return list(index["entries"]) if index else []
+
+
+def info(category, name):
+    """
+    Return the data stored for a canonical entry (e.g., a skill's linked ability).
+    """
+    index = content_index.get(category)
+    return index["entries"].get(name, {}) if index else {}
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import random
+import re
+import sqlite3
+
+# MinHash/LSH settings for near-duplicate detection
+NUM_PERMUTATIONS = 64        # MinHash signature length
+LSH_BANDS = 16               # Bands of LSH_ROWS values; candidates share at least one band
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = 0.6    # Estimated Jaccard similarity at which two hooks count as duplicates
+SHINGLE_SIZE = 3             # Words per shingle
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(2024)  # Fixed seed so signatures stay comparable across restarts
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+# Keywords used to tag adventures when the model doesn't provide a tag line
+SETTING_KEYWORDS = {
+    "forest": ["forest", "woods", "grove", "jungle"],
+    "cave": ["cave", "cavern", "tunnel", "underdark"],
+    "dungeon": ["dungeon", "crypt", "tomb", "ruins", "catacomb"],
+    "city": ["city", "town", "village", "tavern", "market", "castle"],
+    "sea": ["sea", "ship", "coast", "island", "harbor", "pirate"],
+    "mountain": ["mountain", "peak", "cliff", "glacier"],
+    "desert": ["desert", "dune", "oasis"],
+    "swamp": ["swamp", "marsh", "bog"]
+}
+TONE_KEYWORDS = {
+    "dark": ["cursed", "undead", "haunted", "blood", "dread", "necromancer"],
+    "mysterious": ["mysterious", "strange", "secret", "ancient", "riddle"],
+    "lighthearted": ["festival", "prank", "merry", "fair", "feast"],
+    "heroic": ["rescue", "defend", "hero", "save"]
+}
+DIFFICULTIES = {"easy", "medium", "hard", "deadly"}
+
+TAG_LINE_PATTERN = re.compile(r"^\W*tags?\s*:\s*(.*)$", re.IGNORECASE)
+TAG_PAIR_PATTERN = re.compile(r"(setting|tone|difficulty)\s*[=:]\s*([\w-]+)", re.IGNORECASE)
+
+_db_file = None
+_lsh_buckets = {}   # (band, band values) -> [adventure ids]
+_signatures = {}    # adventure id -> MinHash signature
+
+
+# ------------------ MinHash / LSH ------------------
+
+def shingles(text):
+    """
+    Split text into overlapping word shingles.
+    """
+    words = re.findall(r"[a-z']+", text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """
+    Compute the MinHash signature of a text's shingles.
+    Uses blake2b rather than hash() so signatures are stable between processes.
+    """
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles(text)]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(signature_a, signature_b):
+    """
+    Estimate the Jaccard similarity of two texts from their signatures.
+    """
+    return sum(a == b for a, b in zip(signature_a, signature_b)) / NUM_PERMUTATIONS
+
+
+def _bands(signature):
+    for band in range(LSH_BANDS):
+        yield band, tuple(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+
+
+def _index_signature(adventure_id, signature):
+    _signatures[adventure_id] = signature
+    for key in _bands(signature):
+        _lsh_buckets.setdefault(key, []).append(adventure_id)
+
+
+# ------------------ Tagging ------------------
+
+def _keyword_tag(text, keywords, default):
+    words = set(re.findall(r"[a-z]+", text.lower()))
+    for tag, tag_words in keywords.items():
+        if words.intersection(tag_words):
+            return tag
+    return default
+
+
+def extract_tags(adventure_text):
+    """
+    Pull the "Tags: setting=..., tone=..., difficulty=..." line out of an adventure hook.
+    Missing tags are guessed from keywords in the text.
+
+    Returns:
+        tuple: (adventure text without the tag line, {"setting", "tone", "difficulty"})
+    """
+    tags = {}
+    kept_lines = []
+    for line in adventure_text.split("\n"):
+        match = TAG_LINE_PATTERN.match(line.strip())
+        if match:
+            tags.update({key.lower(): value.lower() for key, value in TAG_PAIR_PATTERN.findall(match.group(1))})
+        else:
+            kept_lines.append(line)
+    text = "\n".join(kept_lines).strip()
+
+    tags.setdefault("setting", _keyword_tag(text, SETTING_KEYWORDS, "unknown"))
+    tags.setdefault("tone", _keyword_tag(text, TONE_KEYWORDS, "unknown"))
+    if tags.get("difficulty") not in DIFFICULTIES:
+        tags["difficulty"] = "medium"
+    return text, tags
+
+
+# ------------------ Library Storage ------------------
+
+def init_library(db_file):
+    """
+    Create the library tables if needed and build the LSH index from stored adventures.
+    """
+    global _db_file
+    _db_file = db_file
+    conn = sqlite3.connect(_db_file)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS adventures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            adventure_text TEXT NOT NULL,
+            choices TEXT NOT NULL,
+            setting TEXT,
+            tone TEXT,
+            difficulty TEXT,
+            signature TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS adventure_views (
+            user_id TEXT NOT NULL,
+            adventure_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, adventure_id)
+        )
+    ''')
+    for column in ("setting", "tone", "difficulty"):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_adventures_{column} ON adventures ({column})")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_decisions_user ON decisions (user_id)")
+    conn.commit()
+
+    _lsh_buckets.clear()
+    _signatures.clear()
+    for adventure_id, signature in cursor.execute("SELECT id, signature FROM adventures"):
+        _index_signature(adventure_id, json.loads(signature))
+    conn.close()
+
+
+def find_duplicate(adventure_text):
+    """
+    Return the id of the stored adventure most similar to `adventure_text`,
+    or None if none reaches DUPLICATE_THRESHOLD.
+    """
+    signature = minhash(adventure_text)
+    candidates = {adventure_id for key in _bands(signature) for adventure_id in _lsh_buckets.get(key, [])}
+
+    best_id, best_score = None, DUPLICATE_THRESHOLD
+    for adventure_id in candidates:
+        score = similarity(signature, _signatures[adventure_id])
+        if score >= best_score:
+            best_id, best_score = adventure_id, score
+    return best_id
+
+
+def add_adventure(adventure_text, choices, tags):
+    """
+    Store a parsed adventure in the library and index it.
+
+    Returns:
+        int: The new adventure's id.
+    """
+    signature = minhash(adventure_text)
+    conn = sqlite3.connect(_db_file)
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO adventures (adventure_text, choices, setting, tone, difficulty, signature)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (adventure_text, json.dumps(choices), tags["setting"], tags["tone"], tags["difficulty"], json.dumps(signature)))
+    adventure_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+
+    _index_signature(adventure_id, signature)
+    return adventure_id
+
+
+# Adventures a user has been served, or has made a decision in
+_UNSEEN_CLAUSE = '''
+    id NOT IN (SELECT adventure_id FROM adventure_views WHERE user_id = ?)
+    AND adventure_text NOT IN (
+        SELECT adventure_text FROM decisions WHERE user_id = ? AND adventure_text IS NOT NULL
+    )
+'''
+
+
+def find_adventure(user_id, filters=()):
+    """
+    Pick a random stored adventure the user hasn't seen.
+
+    Args:
+        user_id (str): The player's unique ID.
+        filters (list): Words that must each match the setting, tone, or difficulty tag.
+
+    Returns:
+        tuple | None: (adventure id, adventure text, choices), or None if nothing matches.
+    """
+    query = f"SELECT id, adventure_text, choices FROM adventures WHERE {_UNSEEN_CLAUSE}"
+    params = [user_id, user_id]
+    for word in filters:
+        query += " AND ? IN (setting, tone, difficulty)"
+        params.append(word.lower())
+    query += " ORDER BY RANDOM() LIMIT 1"
+
+    conn = sqlite3.connect(_db_file)
+    row = conn.execute(query, params).fetchone()
+    conn.close()
+    if row is None:
+        return None
+    return row[0], row[1], json.loads(row[2])
+
+
+def has_seen(user_id, adventure_id):
+    """
+    Check whether a user has already been served (or played) a stored adventure.
+    """
+    conn = sqlite3.connect(_db_file)
+    row = conn.execute(f"SELECT 1 FROM adventures WHERE id = ? AND NOT ({_UNSEEN_CLAUSE})", (adventure_id, user_id, user_id)).fetchone()
+    conn.close()
+    return row is not None
+
+
+def mark_seen(user_id, adventure_id):
+    """
+    Record that an adventure was served to a user.
+    """
+    conn = sqlite3.connect(_db_file)
+    conn.execute("INSERT OR IGNORE INTO adventure_views (user_id, adventure_id) VALUES (?, ?)", (user_id, adventure_id))
+    conn.commit()
+    conn.close()
@@ -0,0 +1,239 @@
+import concurrent.futures
+import multiprocessing
+import os
+import re
+import time
+
+import numpy as np
+
+# Simulation defaults for !simulate
+DEFAULT_TRIALS = 20000     # Total combats to simulate per request
+CHUNK_SIZE = 2000          # Combats per worker task
+TIME_BUDGET = 8.0          # Seconds to wait for results before reporting what finished
+MAX_ROUNDS = 50            # Combats still running after this many rounds count as losses
+PROFICIENCY_BONUS = 2      # Level 1 proficiency bonus for player attacks
+
+DICE_PATTERN = re.compile(r"^(\d+)d(\d+)\s*([+-]\s*\d+)?$")
+
+_pool = None
+
+
+def parse_dice(expression):
+    """
+    Parse a dice expression like "2d6+3" into (count, sides, bonus).
+    """
+    match = DICE_PATTERN.match(expression.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid dice expression: {expression}")
+    count, sides, bonus = match.groups()
+    return int(count), int(sides), int(bonus.replace(" ", "")) if bonus else 0
+
+
+def calc_modifier(score):
+    return (score - 10) // 2
+
+
+def combatant_from_player(stats):
+    """
+    Build a combatant from a registered character in `player_stats`.
+    Characters have no gear yet, so AC is 10 + Dexterity and they attack with a
+    d8 weapon using the better of Strength or Dexterity.
+    """
+    mods = {ability: calc_modifier(stats.get(ability, 10)) for ability in
+            ("Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma")}
+    attack_mod = max(mods["Strength"], mods["Dexterity"])
+    return {
+        "name": stats.get("Name", "Adventurer"),
+        "hp": stats["HP"],
+        "ac": 10 + mods["Dexterity"],
+        "attack_bonus": PROFICIENCY_BONUS + attack_mod,
+        "damage": (1, 8, attack_mod),
+        "initiative": mods["Dexterity"],
+        "saves": mods,
+        "special": None
+    }
+
+
+def combatant_from_monster(name, block):
+    """
+    Build a combatant from a monster stat block in content.json.
+
+    Args:
+        name (str): The monster's name.
+        block (dict): Stat block with ac, hp, attack_bonus, damage, dex and an optional
+            "special" save attack ({"ability", "dc", "damage", "recharge"}).
+    """
+    special = block.get("special")
+    if special:
+        special = {
+            "ability": special["ability"],
+            "dc": special["dc"],
+            "damage": parse_dice(special["damage"]),
+            "recharge": special.get("recharge", 5)
+        }
+    return {
+        "name": name,
+        "hp": block["hp"],
+        "ac": block["ac"],
+        "attack_bonus": block["attack_bonus"],
+        "damage": parse_dice(block["damage"]),
+        "initiative": calc_modifier(block.get("dex", 10)),
+        "saves": {},
+        "special": special
+    }
+
+
+def _roll_damage(rng, dice, size, crit=None):
+    """
+    Roll `size` damage totals for (count, sides, bonus) dice, doubling the dice on crits.
+    """
+    count, sides, bonus = dice
+    rolls = rng.integers(1, sides + 1, size=(size, count * 2))
+    if crit is None:
+        total = rolls[:, :count].sum(axis=1)
+    else:
+        total = rolls[:, :count].sum(axis=1) + np.where(crit, rolls[:, count:].sum(axis=1), 0)
+    return np.maximum(total + bonus, 0)
+
+
+def simulate_chunk(party, monsters, trials, seed, max_rounds=MAX_ROUNDS):
+    """
+    Run `trials` independent combats at once, one numpy row per combat.
+
+    Every row rolls its own initiative order. Each round, initiative slots are
+    processed in order and every combatant acting in that slot attacks a random
+    living enemy (or uses its recharge save attack against all of them).
+
+    Returns:
+        dict: Arrays of party wins, rounds fought, and fraction of party HP lost.
+    """
+    rng = np.random.default_rng(seed)
+    combatants = party + monsters
+    count = len(combatants)
+    side = np.array([0] * len(party) + [1] * len(monsters))
+    max_hp = np.array([c["hp"] for c in combatants])
+    ac = np.array([c["ac"] for c in combatants])
+
+    hp = np.tile(max_hp, (trials, 1))
+    initiative = rng.integers(1, 21, size=(trials, count)) + np.array([c["initiative"] for c in combatants])
+    order = np.argsort(-(initiative + rng.random((trials, count))), axis=1)  # Random tie-breaks
+
+    done = np.zeros(trials, dtype=bool)
+    party_won = np.zeros(trials, dtype=bool)
+    rounds = np.full(trials, max_rounds)
+
+    for current_round in range(1, max_rounds + 1):
+        for slot in range(count):
+            for actor, stats in enumerate(combatants):
+                rows = np.nonzero((order[:, slot] == actor) & (hp[:, actor] > 0) & ~done)[0]
+                if rows.size == 0:
+                    continue
+
+                enemies = np.nonzero(side != side[actor])[0]
+                enemy_alive = hp[np.ix_(rows, enemies)] > 0
+
+                special = stats["special"]
+                use_special = np.zeros(rows.size, dtype=bool)
+                if special:
+                    use_special = rng.integers(1, 7, size=rows.size) >= special["recharge"]
+                    for column, enemy in enumerate(enemies):
+                        hit = use_special & enemy_alive[:, column]
+                        save_bonus = combatants[enemy]["saves"].get(special["ability"], 0)
+                        saved = rng.integers(1, 21, size=rows.size) + save_bonus >= special["dc"]
+                        damage = _roll_damage(rng, special["damage"], rows.size)
+                        damage = np.where(saved, damage // 2, damage)
+                        hp[rows, enemy] -= np.where(hit, damage, 0)
+
+                # Pick a random living enemy for each ordinary attack
+                target = enemies[np.where(enemy_alive, rng.random(enemy_alive.shape), -1.0).argmax(axis=1)]
+                d20 = rng.integers(1, 21, size=rows.size)
+                crit = d20 == 20
+                hit = ~use_special & enemy_alive.any(axis=1) & (crit | ((d20 != 1) & (d20 + stats["attack_bonus"] >= ac[target])))
+                damage = _roll_damage(rng, stats["damage"], rows.size, crit)
+                hp[rows, target] -= np.where(hit, damage, 0)
+
+            party_alive = (hp[:, side == 0] > 0).any(axis=1)
+            monsters_alive = (hp[:, side == 1] > 0).any(axis=1)
+            finished = ~done & (~party_alive | ~monsters_alive)
+            party_won[finished] = ~monsters_alive[finished]
+            rounds[finished] = current_round
+            done |= finished
+
+        if done.all():
+            break
+
+    party_max_hp = max_hp[side == 0]
+    hp_lost = (party_max_hp - np.clip(hp[:, side == 0], 0, None)).sum(axis=1) / party_max_hp.sum()
+    return {"party_won": party_won, "rounds": rounds, "hp_lost": hp_lost}
+
+
+def get_pool():
+    """
+    Return the shared process pool, starting it on first use.
+    Workers are always spawned, never forked: the bot process runs threads
+    (the event loop plus executor threads), and forking it can deadlock.
+    """
+    global _pool
+    if _pool is None:
+        _pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def run_simulation(party, monsters, trials=DEFAULT_TRIALS, time_budget=TIME_BUDGET):
+    """
+    Simulate an encounter across the process pool and summarize the outcomes.
+    Chunks that have not finished when the time budget runs out are dropped,
+    so the report may cover fewer trials than requested. Queued chunks are
+    cancelled, but a chunk already running can't be stopped and finishes in the
+    background; CHUNK_SIZE keeps that to one short chunk per worker.
+
+    Args:
+        party (list): Combatants built with combatant_from_player().
+        monsters (list): Combatants built with combatant_from_monster().
+        trials (int): Number of combats to simulate.
+        time_budget (float): Seconds to wait for results.
+
+    Returns:
+        dict: Trial count, win rate, rounds-to-win and HP-loss percentiles, and elapsed time.
+
+    Raises:
+        ValueError: If either side of the encounter is empty.
+        concurrent.futures.process.BrokenProcessPool: If a worker process died. The pool
+            is discarded so the next call starts a new one.
+    """
+    if not party or not monsters:
+        raise ValueError("An encounter needs at least one party member and one monster")
+
+    start = time.perf_counter()
+    chunk_sizes = [min(CHUNK_SIZE, trials - i) for i in range(0, trials, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence().spawn(len(chunk_sizes))
+
+    global _pool
+    try:
+        pool = get_pool()
+        futures = [pool.submit(simulate_chunk, party, monsters, size, seed) for size, seed in zip(chunk_sizes, seeds)]
+        finished, pending = concurrent.futures.wait(futures, timeout=time_budget)
+        for future in pending:
+            future.cancel()
+        results = [future.result() for future in finished]
+    except concurrent.futures.process.BrokenProcessPool:
+        _pool = None  # A worker died; start a fresh pool on the next request
+        raise
+    if not results:
+        return {"trials": 0, "elapsed": time.perf_counter() - start}
+
+    party_won = np.concatenate([r["party_won"] for r in results])
+    rounds = np.concatenate([r["rounds"] for r in results])
+    hp_lost = np.concatenate([r["hp_lost"] for r in results])
+    win_rounds = rounds[party_won]
+
+    return {
+        "trials": party_won.size,
+        "win_rate": party_won.mean(),
+        "rounds_to_win": np.percentile(win_rounds, [10, 50, 90]) if win_rounds.size else None,
+        "hp_lost": np.percentile(hp_lost, [10, 50, 90]),
+        "elapsed": time.perf_counter() - start
+    }